@@ -0,0 +1,88 @@
+import gc
+import sys
+import json
+import time
+import tracemalloc
+from datetime import date
+from operator import attrgetter
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+
+from etl import Expense
+
+# --- Benchmark: ETL validation and API serialization ---
+# Compares the old per-row paths with the bulk ones, on a synthetic
+# expenses payload (no APIs or database needed).
+#
+#   python bench_etl.py [ROWS]
+#
+# Time is measured without tracing; peak memory is measured in a separate
+# run under tracemalloc.
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+def make_rows(count: int) -> List[tuple]:
+    """Cursor-style tuples, like 'SELECT ... FROM expenses' returns."""
+    return [
+        (i, i % 50, f"Vendor {i % 40}", "Cloud hosting for the pilot", 1234.5, "Pending", date(2024, 1, 1 + i % 28))
+        for i in range(count)
+    ]
+
+EXPENSE_COLUMNS = ("id", "project_id", "vendor", "description", "amount", "status", "date")
+
+# --- ETL side: JSON bytes -> load tuples ---
+def etl_old(body: bytes) -> List[tuple]:
+    data = json.loads(body)
+    validated = [Expense.model_validate(item) for item in data]
+    dumped = [item.model_dump() for item in validated]
+    return [
+        (e["id"], e["project_id"], e["vendor"], e["description"], e["amount"], e["status"], e["date"], "finance_api")
+        for e in dumped
+    ]
+
+def etl_new(body: bytes) -> List[tuple]:
+    rows = TypeAdapter(List[Expense]).validate_json(body)
+    to_tuple = attrgetter(*Expense.model_fields)
+    return [to_tuple(row) + ("finance_api",) for row in rows]
+
+# --- API side: cursor tuples -> JSON bytes ---
+def api_old(rows: List[tuple]) -> bytes:
+    # dict per row, then response_model validation, then serialization
+    expenses = [dict(zip(EXPENSE_COLUMNS, row)) for row in rows]
+    adapter = TypeAdapter(List[Expense])
+    return adapter.dump_json(adapter.validate_python(
+        [{**e, "date": e["date"].isoformat()} for e in expenses]
+    ))
+
+def api_new(rows: List[tuple]) -> bytes:
+    return orjson.dumps([dict(zip(EXPENSE_COLUMNS, row)) for row in rows])
+
+def measure(func, arg):
+    gc.collect()
+    start = time.perf_counter()
+    func(arg)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    func(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+def report(label, old, new):
+    (old_s, old_peak), (new_s, new_peak) = old, new
+    print(f"{label}")
+    print(f"  old: {old_s:6.2f}s  peak {old_peak / 1e6:7.1f} MB  ({old_s / ROWS * 1e6:.2f} us/row)")
+    print(f"  new: {new_s:6.2f}s  peak {new_peak / 1e6:7.1f} MB  ({new_s / ROWS * 1e6:.2f} us/row)")
+
+if __name__ == "__main__":
+    rows = make_rows(ROWS)
+    body = api_new(rows)
+    assert etl_old(body) == etl_new(body), "old and new ETL paths disagree"
+
+    print(f"--- {ROWS} expense rows ---")
+    report("ETL fetch_data (bytes -> tuples)", measure(etl_old, body), measure(etl_new, body))
+    report("API /expenses (tuples -> bytes)", measure(api_old, rows), measure(api_new, rows))
@@ -3,6 +3,7 @@ import requests
 import json
 import pandas as pd
 from io import StringIO
+from requests.adapters import HTTPAdapter
 from PIL import Image # For handling image display
 
 # --- Configuration ---
@@ -10,22 +11,67 @@ API_BASE_URL ="http://127.0.0.1:8080"
 LOGO_PATH = "/Applications/PostgreSQL 18/api_project/.streamlit/logo.png" # Path to your Valeriox logo
 PORTAL_NAME = "Valeriox" # Your chosen portal name
 PORTAL_SLOGAN = "AI-Integrated Command & Control" # Your slogan
+REPORT_CACHE_TTL = 30 # Seconds before a cached report page is revalidated with the backend
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+
+# Friendly names for the blocked-tasks report columns
+REPORT_COLUMN_NAMES = {
+    "project_name": "Project",
+    "task_name": "Task",
+    "employee_name": "Assigned Employee",
+    "employee_role": "Employee Role",
+    "blocker_notes": "Blocker Details",
+    "blocked_expense_vendor": "Blocked Expense Vendor",
+    "blocked_expense_status": "Blocked Expense Status (Finance)"
+}
+REPORT_HIDDEN_COLUMNS = ['task_id', 'blocked_expense_id', 'status']
 
 # --- Helper Functions ---
-def fetch_data(endpoint):
-    try:
-        response = requests.get(f"{API_BASE_URL}/{endpoint}")
-        response.raise_for_status() 
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"❌ Could not connect to API: {API_BASE_URL}/{endpoint}. Ensure the main_portal.py server is running.")
-        return None
+@st.cache_resource
+def get_session():
+    """One pooled HTTP session, shared by every rerun and every user."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+    return session
+
+@st.cache_resource
+def get_etag_store():
+    """Last ETag and result seen for each report page, for conditional GETs."""
+    return {}
+
+@st.cache_data(ttl=REPORT_CACHE_TTL, show_spinner=False)
+def fetch_report_page(page, page_size, sort_by, sort_dir):
+    """
+    Fetches one page of the blocked-tasks report, ready for display.
+    Reruns within the TTL never touch the backend. After the TTL we send the
+    last ETag, and an unchanged report comes back as an empty 304.
+    Errors are raised (not cached), so the next rerun retries.
+    """
+    params = {"limit": page_size, "offset": page * page_size, "sort_by": sort_by, "sort_dir": sort_dir}
+    key = tuple(params.values())
+    etag_store = get_etag_store()
+    headers = {}
+    if key in etag_store:
+        headers["If-None-Match"] = etag_store[key][0]
+
+    response = get_session().get(f"{API_BASE_URL}/reports/blocked-tasks", params=params, headers=headers)
+    if response.status_code == 304:
+        return etag_store[key][1]
+    response.raise_for_status()
+
+    df = pd.DataFrame(response.json())
+    if not df.empty:
+        df = df.drop(columns=REPORT_HIDDEN_COLUMNS).rename(columns=REPORT_COLUMN_NAMES)
+    result = (df, int(response.headers.get("X-Total-Count", len(df))))
+    if "ETag" in response.headers:
+        etag_store[key] = (response.headers["ETag"], result)
+    return result
 
 def post_query_to_ai(question):
     headers = {"Content-Type": "application/json"}
     payload = {"question": question}
     try:
-        response = requests.post(f"{API_BASE_URL}/ask-ai", headers=headers, data=json.dumps(payload))
+        response = get_session().post(f"{API_BASE_URL}/ask-ai", headers=headers, data=json.dumps(payload))
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -144,23 +190,32 @@ st.markdown("---")
 st.header("🛑 Live Blocked Task Report")
 st.caption("Auto-generated report showing cross-departmental bottlenecks in real-time.")
 
-report_data = fetch_data("reports/blocked-tasks")
-
-if report_data:
-    df = pd.DataFrame(report_data)
-
-    df_display = df.rename(columns={
-        "project_name": "Project",
-        "task_name": "Task",
-        "employee_name": "Assigned Employee",
-        "employee_role": "Employee Role",
-        "blocker_notes": "Blocker Details",
-        "blocked_expense_vendor": "Blocked Expense Vendor",
-        "blocked_expense_status": "Blocked Expense Status (Finance)"
-    })
-
-    df_display = df_display.drop(columns=['task_id', 'blocked_expense_id', 'status'])
-
-    st.dataframe(df_display, use_container_width=True, hide_index=True)
+# Paging and sorting happen on the server; only the visible page is loaded
+sort_col, dir_col, size_col, page_col = st.columns(4)
+sort_by = sort_col.selectbox(
+    "Sort by",
+    options=["task_id", *REPORT_COLUMN_NAMES],
+    format_func=lambda column: REPORT_COLUMN_NAMES.get(column, "Task ID")
+)
+sort_dir = dir_col.radio("Order", options=["asc", "desc"], horizontal=True)
+page_size = size_col.selectbox("Rows per page", options=PAGE_SIZE_OPTIONS)
+page = page_col.number_input("Page", min_value=1, step=1) - 1
+
+try:
+    report_page, total_rows = fetch_report_page(page, page_size, sort_by, sort_dir)
+except requests.exceptions.HTTPError as e:
+    st.error(f"❌ The portal rejected the report request: {e}")
+    report_page, total_rows = None, 0
+except requests.exceptions.RequestException as e:
+    st.error(f"❌ Could not connect to API: {API_BASE_URL}/reports/blocked-tasks. Ensure the main_portal.py server is running.")
+    report_page, total_rows = None, 0
+
+if report_page is not None and not report_page.empty:
+    st.dataframe(report_page, use_container_width=True, hide_index=True)
+    st.caption(f"Showing {page * page_size + 1}-{page * page_size + len(report_page)} of {total_rows} blocked tasks.")
+elif report_page is not None and total_rows:
+    st.info(f"Page {page + 1} is empty. There are {total_rows} blocked tasks in total.")
+elif report_page is not None:
+    st.success("✅ No blocked tasks right now.")
 else:
-    st.warning("Blocked tasks report not loaded. Ensure your main_portal.py server is running on port 8080.")
\ No newline at end of file
+    st.warning("Blocked tasks report not loaded. Ensure your main_portal.py server is running on port 8080.")
@@ -0,0 +1,197 @@
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+# --- Fast Path for Common Questions ---
+# Most /ask-ai questions have one of a few shapes ("who is blocked?",
+# "what is the budget for project X?", "how much did we spend per vendor?").
+# These are matched here and answered with fixed, parameterized SQL: no LLM
+# call at all. Anything that doesn't match falls through to the SQL agent.
+#
+# Each template lists the WHOLE question shapes it accepts (re.fullmatch),
+# so extra conditions ("not blocked", "per project", "last month") make the
+# question miss and go to the agent instead of getting a wrong answer.
+# A name is only looked up in the slot the shape reserves for it.
+
+FUZZY_CUTOFF = 0.85 # How close the slot text must be to a known name
+
+# --- Name Index ---
+def normalize(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+def build_name_index(names: List[str]) -> Dict[str, str]:
+    """Maps normalized names to the exact stored name."""
+    return {normalize(name): name for name in names if normalize(name)}
+
+def build_first_name_index(names: List[str]) -> Dict[str, str]:
+    """
+    Maps first names that belong to exactly one person to that person.
+    Only used for a template's person slot ("is Priya blocked?"), never to
+    search free text, so a first name like "Will" can't match the verb.
+    """
+    people = {}
+    for name in names:
+        first = normalize(name).split(" ")[0]
+        if first:
+            people.setdefault(first, []).append(name)
+    return {first: matches[0] for first, matches in people.items() if len(matches) == 1}
+
+def resolve_name(slot: str, index: Dict[str, str], first_names: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Returns the stored name the slot text refers to, if any: an exact
+    name, a unique first name, or a full name within FUZZY_CUTOFF (typos).
+    The whole slot must be the name; "AWS in March" is not "AWS".
+    """
+    text = normalize(slot)
+    if text in index:
+        return index[text]
+    if first_names and text in first_names:
+        return first_names[text]
+    best_score, best_name = 0.0, None
+    for alias, name in index.items():
+        score = SequenceMatcher(None, alias, text).ratio()
+        if score >= FUZZY_CUTOFF and score > best_score:
+            best_score, best_name = score, name
+    return best_name
+
+# --- Answer Formatting ---
+def money(amount) -> str:
+    return f"{amount:,.2f}"
+
+def answer_blocked(rows, name: Optional[str]) -> str:
+    if not rows:
+        return f"{name} has no blocked tasks." if name else "No tasks are blocked right now."
+    lines = [f"- {row['employee_name']} is blocked on '{row['task_name']}': {row['blocker_notes']}" for row in rows]
+    return "\n".join([f"{len(rows)} blocked task(s):"] + lines)
+
+def answer_budget(rows, name: str) -> str:
+    if not rows:
+        return f"I couldn't find a project called {name}."
+    row = rows[0]
+    # Only approved expenses count as spent; pending ones are mentioned
+    # separately and rejected ones not at all
+    remaining = row["total_budget"] - row["approved"]
+    answer = (
+        f"The total budget for {row['name']} is {money(row['total_budget'])}. "
+        f"{money(row['approved'])} has been spent (approved expenses), leaving {money(remaining)}."
+    )
+    if row["pending"]:
+        answer += f" A further {money(row['pending'])} is pending approval."
+    return answer
+
+def answer_vendor_spend(rows, name: Optional[str]) -> str:
+    if not rows:
+        return f"There are no expenses for {name}." if name else "There are no expenses yet."
+    if name:
+        return f"Total spend with {rows[0]['vendor']} is {money(rows[0]['total_spend'])}."
+    lines = [f"- {row['vendor'] or 'Unknown vendor'}: {money(row['total_spend'])}" for row in rows]
+    return "\n".join(["Spend by vendor:"] + lines)
+
+# --- Templates ---
+# Tried in order. 'patterns' are whole-question regexes (matched against the
+# lower-cased question without its trailing '?'). Shapes with a (?P<name>...)
+# slot only match if the slot resolves to a known name from the 'entity' index.
+NOW = r"(?: right now| currently)?"
+
+FAST_PATH_TEMPLATES = [
+    {
+        "name": "blocked_all",
+        "patterns": [
+            r"(?:who|who's|what|which (?:employees?|people|tasks?)|what tasks?) (?:is |are )?(?:currently |still )?blocked" + NOW + r"(?: and why)?",
+            r"(?:show(?: me)?|list)(?: all)?(?: the)? blocked tasks" + NOW,
+        ],
+        "entity": None,
+        "sql": """SELECT e.name AS employee_name, t.task_name, t.blocker_notes
+FROM unified_tasks t
+JOIN unified_employees e ON t.assignee_id = e.id
+WHERE t.status = 'Blocked'
+ORDER BY e.name, t.id""",
+        "answer": answer_blocked,
+    },
+    {
+        "name": "blocked_employee",
+        "patterns": [
+            r"(?:why )?is (?P<name>.+?) (?:currently |still )?blocked" + NOW + r"(?: and why)?",
+            r"what is (?P<name>.+?) blocked (?:on|by)",
+        ],
+        "entity": "employee",
+        "sql": """SELECT e.name AS employee_name, t.task_name, t.blocker_notes
+FROM unified_tasks t
+JOIN unified_employees e ON t.assignee_id = e.id
+WHERE t.status = 'Blocked' AND e.name = $1
+ORDER BY t.id""",
+        "answer": answer_blocked,
+    },
+    {
+        "name": "project_budget",
+        "patterns": [
+            r"(?:what is|what's|show(?: me)?) the (?:total )?budget (?:for|of) (?:the )?(?P<name>.+?)(?: project)?",
+            r"(?:what is|what's|show(?: me)?) (?:the )?(?P<name>.+?)(?: project)?'s (?:total )?budget",
+            r"how much budget does (?:the )?(?P<name>.+?)(?: project)? have",
+        ],
+        "entity": "project",
+        "sql": """SELECT p.name, p.total_budget,
+       COALESCE(SUM(ex.amount) FILTER (WHERE ex.status = 'Approved'), 0) AS approved,
+       COALESCE(SUM(ex.amount) FILTER (WHERE ex.status = 'Pending'), 0) AS pending
+FROM unified_projects p
+LEFT JOIN unified_expenses ex ON ex.project_id = p.id
+WHERE p.name = $1
+GROUP BY p.id, p.name, p.total_budget""",
+        "answer": answer_budget,
+    },
+    {
+        "name": "vendor_spend",
+        "patterns": [
+            r"how much (?:have we|did we|do we) (?:spent|spend|paid|pay) (?:with|to|on|per|by) (?:each |every |all |our )?vendors?(?: in total| so far)?",
+            r"(?:what is |what's |show(?: me)? |list )?(?:the )?(?:total )?spend(?:ing)? (?:by|per) vendor",
+        ],
+        "entity": None,
+        "sql": """SELECT vendor, SUM(amount) AS total_spend
+FROM unified_expenses
+GROUP BY vendor
+ORDER BY total_spend DESC""",
+        "answer": answer_vendor_spend,
+    },
+    {
+        "name": "vendor_spend_single",
+        "patterns": [
+            r"how much (?:have we|did we|do we) (?:(?:spent|spend)(?: in total)? (?:with|on)|(?:paid|pay)(?: in total)?(?: to)?) (?P<name>.+?)(?: in total| so far)?",
+            r"(?:what is|what's) (?:the )?(?:total )?spend(?:ing)? (?:with|on) (?P<name>.+?)(?: so far)?",
+        ],
+        "entity": "vendor",
+        "sql": """SELECT vendor, SUM(amount) AS total_spend
+FROM unified_expenses
+WHERE vendor = $1
+GROUP BY vendor""",
+        "answer": answer_vendor_spend,
+    },
+]
+
+def normalize_question(question: str) -> str:
+    """Lower-case, single spaces, no trailing punctuation, straight apostrophes."""
+    text = " ".join(question.lower().replace("\u2019", "'").split())
+    return text.rstrip("?!. ")
+
+def match_question(question: str, name_indexes: Dict[str, Dict[str, str]]) -> Optional[Tuple[dict, Optional[str]]]:
+    """
+    Returns (template, entity name or None) for the first template with a
+    shape matching the whole question, or None if the agent should handle it.
+    'name_indexes' has an index per entity, plus '<entity>_first' for first names.
+    """
+    text = normalize_question(question)
+    for template in FAST_PATH_TEMPLATES:
+        for pattern in template["patterns"]:
+            match = re.fullmatch(pattern, text)
+            if match is None:
+                continue
+            if not template["entity"]:
+                return template, None
+            entity = template["entity"]
+            name = resolve_name(
+                match.group("name"),
+                name_indexes.get(entity, {}),
+                name_indexes.get(f"{entity}_first"),
+            )
+            if name is not None:
+                return template, name
+    return None
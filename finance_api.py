@@ -1,6 +1,7 @@
 from typing import Optional, List
 import psycopg2
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from datetime import date
 
@@ -54,21 +55,15 @@ def get_all_projects():
         return {"error": "Database connection failed"}
     
     with conn.cursor() as cursor:
-        cursor.execute("SELECT id, name, total_budget FROM projects")
+        cursor.execute("SELECT id, name, total_budget::float8 FROM projects")
         rows = cursor.fetchall()
     
     conn.close()
     
-    # Manually convert tuples to dictionaries
-    projects = []
-    for row in rows:
-        projects.append({
-            "id": row[0],
-            "name": row[1],
-            "total_budget": row[2]
-        })
-        
-    return projects
+    # Serialize the tuples directly. Returning a Response skips the
+    # response_model re-validation (the model is still used for the docs).
+    columns = ("id", "name", "total_budget")
+    return ORJSONResponse([dict(zip(columns, row)) for row in rows])
 
 @app.get("/expenses", response_model=List[Expense])
 def get_all_expenses():
@@ -80,22 +75,11 @@ def get_all_expenses():
         return {"error": "Database connection failed"}
     
     with conn.cursor() as cursor:
-        cursor.execute("SELECT id, project_id, vendor, description, amount, status, date FROM expenses")
+        cursor.execute("SELECT id, project_id, vendor, description, amount::float8, status, date FROM expenses")
         rows = cursor.fetchall()
     
     conn.close()
     
-    # Manually convert tuples to dictionaries
-    expenses = []
-    for row in rows:
-        expenses.append({
-            "id": row[0],
-            "project_id": row[1],
-            "vendor": row[2],
-            "description": row[3],
-            "amount": row[4],
-            "status": row[5],
-            "date": row[6]
-        })
-        
-    return expenses
\ No newline at end of file
+    # Serialize the tuples directly (see get_all_projects)
+    columns = ("id", "project_id", "vendor", "description", "amount", "status", "date")
+    return ORJSONResponse([dict(zip(columns, row)) for row in rows])
\ No newline at end of file
@@ -1,5 +1,6 @@
 import psycopg2
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from datetime import date
 
@@ -65,18 +66,10 @@ def get_all_employees():
     
     conn.close()
     
-    # --- THIS IS THE FIX ---
-    # Manually convert the list of tuples into a list of dictionaries
-    employees = []
-    for row in rows:
-        employees.append({
-            "id": row[0],
-            "name": row[1],
-            "role": row[2],
-            "department": row[3]
-        })
-        
-    return employees  # Return the new list of dictionaries
+    # Serialize the tuples directly. Returning a Response skips the
+    # response_model re-validation (the model is still used for the docs).
+    columns = ("id", "name", "role", "department")
+    return ORJSONResponse([dict(zip(columns, row)) for row in rows])
 
 
 @app.get("/timesheets", response_model=list[Timesheet])
@@ -90,21 +83,11 @@ def get_all_timesheets():
     
     # Use a default cursor
     with conn.cursor() as cursor:
-        cursor.execute("SELECT id, employee_id, project_id, hours_logged, date FROM timesheets")
+        cursor.execute("SELECT id, employee_id, project_id, hours_logged::float8, date FROM timesheets")
         rows = cursor.fetchall()
     
     conn.close()
     
-    # --- THIS IS THE FIX ---
-    # Manually convert the list of tuples into a list of dictionaries
-    timesheets = []
-    for row in rows:
-        timesheets.append({
-            "id": row[0],
-            "employee_id": row[1],
-            "project_id": row[2],
-            "hours_logged": row[3],
-            "date": row[4]
-        })
-        
-    return timesheets  # Return the new list of dictionaries
\ No newline at end of file
+    # Serialize the tuples directly (see get_all_employees)
+    columns = ("id", "employee_id", "project_id", "hours_logged", "date")
+    return ORJSONResponse([dict(zip(columns, row)) for row in rows])
\ No newline at end of file
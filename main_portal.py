@@ -1,8 +1,21 @@
 from fastapi.middleware.cors import CORSMiddleware
 import os
-import psycopg2
+import time
+import random
+import asyncio
+import hashlib
+import secrets
+import asyncpg
+import httpx
+from cachetools import TTLCache
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from sqlalchemy import create_engine, event, inspect
 from typing import Optional, List
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -11,6 +24,8 @@ from langchain_community.utilities.sql_database import SQLDatabase
 from langchain_openai import ChatOpenAI  # <-- THIS IS NOW OPENAI
 from langchain_community.agent_toolkits.sql.base import create_sql_agent 
 from langchain_community.agent_toolkits import SQLDatabaseToolkit
+from retrieval import build_agent_context, index_tables
+from fast_path import build_first_name_index, build_name_index, match_question
 
 # --- Load API Key ---
 # This securely loads your OPENAI_API_KEY from the .env file
@@ -20,7 +35,132 @@ load_dotenv()
 # IMPORTANT: Replace 'YOUR_PASSWORD' with your PostgreSQL password
 DB_CONNECT_STRING = os.getenv("DATABASE_URL")
 
-app = FastAPI()
+# The source APIs, for the live-read endpoints (same ports the ETL uses)
+HR_API_URL = os.getenv("HR_API_URL", "http://127.0.0.1:8000")
+FINANCE_API_URL = os.getenv("FINANCE_API_URL", "http://127.0.0.1:8001")
+PM_API_URL = os.getenv("PM_API_URL", "http://127.0.0.1:8002")
+LIVE_CACHE_TTL = 5       # Seconds a live response is reused before we ask the source again
+LIVE_TIMEOUT = 2.0       # Seconds before a source API call counts as failed
+
+# Opt-in slow-query log: set SLOW_QUERY_MS (e.g. 200) to record every statement
+# slower than that. A sample of them also gets an EXPLAIN (ANALYZE, BUFFERS).
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))  # 0 = off
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0.2"))
+SLOW_QUERY_LOG_SIZE = 100
+# The log holds raw SQL, parameters and users' questions, so /debug/slow-queries
+# also needs this token (sent as 'X-Debug-Token'). Without it the endpoint is off.
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN")
+
+NAME_INDEX_TTL = 60 # Seconds the fast path's project/employee/vendor name lists are reused
+
+# --- Report Database Pool ---
+# The report endpoints share one asyncpg pool, created when the app starts.
+# asyncpg talks the binary protocol, and conn.fetch() keeps a per-connection
+# cache of prepared statements, so a hot report is parsed once per connection.
+# (conn.prepare() bypasses that cache, so queries go through conn.fetch().)
+db_pool: Optional[asyncpg.Pool] = None
+
+# One pooled HTTP client for all live reads (keeps connections to the APIs open)
+http_client: Optional[httpx.AsyncClient] = None
+
+# --- Slow Query Log ---
+# The last SLOW_QUERY_LOG_SIZE slow statements, newest last (see /debug/slow-queries)
+slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+# The /ask-ai question being answered, so agent SQL can be traced back to it
+current_question: ContextVar[Optional[str]] = ContextVar("current_question", default=None)
+# The server's event loop; agent queries run in worker threads and hand
+# plan captures back to it
+main_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def record_query(source: str, sql: str, params, seconds: float, row_count: int,
+                 explain_params: Optional[tuple] = None):
+    """
+    Logs a statement if it ran longer than SLOW_QUERY_MS. 'explain_params'
+    are the asyncpg arguments to re-run it with for EXPLAIN; None means the
+    plan cannot be captured. Safe to call from any thread.
+    """
+    duration_ms = seconds * 1000
+    if not SLOW_QUERY_MS or duration_ms < SLOW_QUERY_MS:
+        return
+
+    entry = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": source,
+        "question": current_question.get(),
+        "sql": sql.strip(),
+        "params": repr(params),
+        "duration_ms": round(duration_ms, 1),
+        "rows": row_count,
+        "plan": None,
+    }
+    slow_queries.append(entry)
+    print(f"--- Slow query ({entry['duration_ms']} ms, {row_count} rows) from {source} ---")
+
+    # Only plain reads are re-run, and only a sample of them
+    is_read = entry["sql"].upper().startswith(("SELECT", "WITH"))
+    if (explain_params is not None and is_read and main_loop is not None
+            and db_pool is not None and random.random() < SLOW_QUERY_EXPLAIN_RATE):
+        asyncio.run_coroutine_threadsafe(capture_plan(entry, explain_params), main_loop)
+
+async def capture_plan(entry: dict, params: tuple):
+    """Fills in entry['plan'] by re-running its statement under EXPLAIN, read-only."""
+    try:
+        async with db_pool.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                rows = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {entry['sql']}", *params)
+        entry["plan"] = "\n".join(row[0] for row in rows)
+    except Exception as e:
+        entry["plan"] = f"Could not capture plan: {e}"
+
+async def run_query(conn, source: str, sql: str, *params):
+    """Runs a query on an asyncpg connection (cached prepared statement), through the slow-query log."""
+    start = time.perf_counter()
+    rows = await conn.fetch(sql, *params)
+    record_query(source, sql, params, time.perf_counter() - start, len(rows), explain_params=params)
+    return rows
+
+def watch_engine(engine):
+    """Times every statement a SQLAlchemy engine runs (used for the AI agent's queries)."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_start_time"].pop()
+        # The agent's text() SQL reaches psycopg2 with every '%' escaped as '%%';
+        # the driver unescapes it, so do the same to log (and EXPLAIN) what Postgres ran
+        if not parameters and context.dialect.paramstyle in ("format", "pyformat"):
+            statement = statement.replace("%%", "%")
+        # The agent sends literal SQL; anything bound with psycopg2 params can't be re-run by asyncpg
+        record_query("ai-agent", statement, parameters, seconds, cursor.rowcount,
+                     explain_params=None if parameters else ())
+
+def asyncpg_dsn(url: str) -> str:
+    """asyncpg wants a plain 'postgresql://' URL (no '+psycopg2' driver suffix)."""
+    scheme, sep, rest = url.partition("://")
+    return scheme.split("+")[0] + sep + rest
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global db_pool, http_client, main_loop
+    main_loop = asyncio.get_running_loop()
+    http_client = httpx.AsyncClient(
+        timeout=LIVE_TIMEOUT,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    )
+    try:
+        db_pool = await asyncpg.create_pool(asyncpg_dsn(DB_CONNECT_STRING), min_size=1, max_size=10)
+        print("✅ Report database pool created.")
+    except Exception as e:
+        print(f"❌ FAILED TO CREATE REPORT DATABASE POOL: {e}")
+        db_pool = None
+    yield
+    await http_client.aclose()
+    if db_pool is not None:
+        await db_pool.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # This gives permission to your frontend to connect
 origins = ["*"]  # Allows all connections
@@ -31,11 +171,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # Allows GET and POST
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count", "X-Data-Freshness", "X-Data-Sources"], # Paging/caching/freshness headers for browser clients
 )
 # --- Initialize AI Components ---
 try:
     # 1. Connect LangChain to our Unified Database
-    db = SQLDatabase.from_uri(DB_CONNECT_STRING)
+    #    (We build the engine ourselves so the slow-query log can watch it)
+    engine = create_engine(DB_CONNECT_STRING)
+    if SLOW_QUERY_MS:
+        watch_engine(engine)
+    # The ETL's bookkeeping and staging tables are not for the agent
+    internal_tables = [
+        name for name in inspect(engine).get_table_names()
+        if name.startswith(("etl_", "staging_"))
+    ]
+    db = SQLDatabase(engine, ignore_tables=internal_tables)
+
+    # Index the real schema of every table the agent can see (see retrieval.py)
+    index_tables({name: db.get_table_info([name]) for name in db.get_usable_table_names()})
 
     # 2. Get the API key from the environment
     openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -86,20 +239,220 @@ class BlockedTaskReport(BaseModel):
     blocked_expense_vendor: str
     blocked_expense_status: str
 
+class LiveTask(BaseModel):
+    id: int
+    project_id: int
+    assignee_id: int
+    task_name: str
+    status: str
+    blocker_notes: Optional[str]
+
+class LiveExpense(BaseModel):
+    id: int
+    project_id: int
+    vendor: Optional[str]
+    description: Optional[str]
+    amount: float
+    status: str
+    date: str
+
 # New model for the AI's input
 class AIQuery(BaseModel):
     question: str
 
-# --- Database Connection (for old report) ---
-def get_db_connection():
+# --- Report Queries ---
+BLOCKED_TASKS_QUERY = """
+SELECT 
+    t.id AS task_id,
+    t.task_name,
+    p.name AS project_name,
+    e.name AS employee_name,
+    e.role AS employee_role,
+    t.status,
+    t.blocker_notes,
+    ex.id AS blocked_expense_id,
+    ex.vendor AS blocked_expense_vendor,
+    ex.status AS blocked_expense_status
+FROM 
+    unified_tasks t
+JOIN 
+    unified_projects p ON t.project_id = p.id
+JOIN 
+    unified_employees e ON t.assignee_id = e.id
+JOIN 
+    unified_expenses ex ON t.project_id = ex.project_id
+WHERE 
+    t.status = 'Blocked'
+    AND t.blocker_notes LIKE 'Waiting for Expense ID ' || ex.id || '%'
+"""
+
+# Columns the blocked-tasks report may be sorted by (API name -> SQL).
+# The dashboard offers task_id plus every column in its REPORT_COLUMN_NAMES.
+BLOCKED_TASKS_SORT_COLUMNS = {
+    "task_id": "t.id",
+    "task_name": "t.task_name",
+    "project_name": "p.name",
+    "employee_name": "e.name",
+    "employee_role": "e.role",
+    "blocker_notes": "t.blocker_notes",
+    "blocked_expense_vendor": "ex.vendor",
+    "blocked_expense_status": "ex.status",
+}
+
+# --- Report Caching Helpers ---
+async def get_data_version(conn) -> Optional[str]:
+    """
+    Returns a marker that changes whenever the ETL swaps new data into
+    unified_db (the latest finished run), or None if none has finished.
+    """
     try:
-        # This is the correct way. It reads the same
-        # secret URL that the AI agent uses.
-        conn = psycopg2.connect(DB_CONNECT_STRING) 
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
+        return await conn.fetchval("SELECT max(finished_at)::text FROM etl_runs")
+    except asyncpg.UndefinedTableError:
+        return None
+
+def make_etag(version: str, *params) -> str:
+    """Builds an ETag from the data version and the request parameters."""
+    key = ":".join(str(part) for part in (version, *params))
+    return '"' + hashlib.md5(key.encode()).hexdigest() + '"'
+
+# --- Live Read Helpers ---
+# Live endpoints read the source APIs directly. Each source has a short-TTL
+# cache and a circuit breaker. When a source is down (or its breaker is
+# open) we serve the unified_db copy from the last ETL run instead.
+# Every response says where its data came from in 'X-Data-Freshness':
+# "live" (just fetched), "cached" (fetched < LIVE_CACHE_TTL ago) or "etl".
+FRESHNESS_ORDER = ["live", "cached", "etl"]
+
+class CircuitBreaker:
+    """
+    Stops calling a failing source for 'reset_after' seconds once it has
+    failed 'failure_threshold' times in a row ("open"). After that exactly
+    one trial call is let through ("half-open") and every other caller is
+    turned away until it reports back: success closes the breaker, failure
+    opens it again.
+    """
+    def __init__(self, failure_threshold: int = 3, reset_after: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_after:
+            self.state = "half-open" # This caller is the one trial call
+            return True
+        return False # Open and cooling down, or a trial call is in flight
+
+    def record_success(self):
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+class LiveSource:
+    """A source API with its own cache and circuit breaker."""
+    def __init__(self, name: str, base_url: str):
+        self.name = name
+        self.base_url = base_url
+        self.cache = TTLCache(maxsize=32, ttl=LIVE_CACHE_TTL)
+        self.breaker = CircuitBreaker()
+
+LIVE_SOURCES = {
+    "hr": LiveSource("hr", HR_API_URL),
+    "finance": LiveSource("finance", FINANCE_API_URL),
+    "pm": LiveSource("pm", PM_API_URL),
+}
+
+# The unified_db copy of each source endpoint (used when the source is down)
+LIVE_FALLBACK_QUERIES = {
+    ("hr", "/employees"): "SELECT id, name, role, department FROM unified_employees",
+    ("finance", "/projects"): "SELECT id, name, total_budget::float8 AS total_budget FROM unified_projects",
+    ("finance", "/expenses"): """SELECT id, project_id, vendor, description, amount::float8 AS amount,
+                                        status, date::text AS date
+                                 FROM unified_expenses""",
+    ("pm", "/tasks"): "SELECT id, project_id, assignee_id, task_name, status, blocker_notes FROM unified_tasks",
+}
+
+async def fetch_live(source_name: str, path: str):
+    """
+    Reads 'path' from a source API through its cache and circuit breaker,
+    falling back to unified_db. Returns (rows, freshness).
+    """
+    source = LIVE_SOURCES[source_name]
+    if path in source.cache:
+        return source.cache[path], "cached"
+
+    if source.breaker.allow():
+        try:
+            response = await http_client.get(f"{source.base_url}{path}")
+            response.raise_for_status()
+            rows = response.json()
+            source.breaker.record_success()
+            source.cache[path] = rows
+            return rows, "live"
+        except (httpx.HTTPError, ValueError) as e:
+            source.breaker.record_failure()
+            print(f"--- Live read from {source.name} API failed, using ETL copy: {e} ---")
+        except BaseException:
+            # e.g. the request was cancelled: still report back, so a
+            # half-open breaker isn't left waiting for its trial call forever
+            source.breaker.record_failure()
+            raise
+
+    if db_pool is None:
+        raise HTTPException(status_code=503, detail=f"{source.name} API and database are both unavailable")
+    async with db_pool.acquire() as conn:
+        rows = await run_query(conn, "live-fallback", LIVE_FALLBACK_QUERIES[(source_name, path)])
+    return [dict(row) for row in rows], "etl"
+
+def freshness_headers(parts: dict) -> dict:
+    """Headers for a response built from {source_name: freshness}."""
+    overall = max(parts.values(), key=FRESHNESS_ORDER.index) # The stalest part wins
+    return {
+        "X-Data-Freshness": overall,
+        "X-Data-Sources": ", ".join(f"{name}={fresh}" for name, fresh in parts.items()),
+    }
+
+# --- Fast Path Helpers ---
+# Names the fast path can recognise in a question (see fast_path.py)
+name_index_cache = TTLCache(maxsize=1, ttl=NAME_INDEX_TTL)
+
+async def get_name_indexes(conn) -> dict:
+    """Project, employee and vendor name indexes, cached for NAME_INDEX_TTL seconds."""
+    if "indexes" not in name_index_cache:
+        projects = await run_query(conn, "fast-path-names", "SELECT name FROM unified_projects")
+        employees = await run_query(conn, "fast-path-names", "SELECT name FROM unified_employees")
+        vendors = await run_query(conn, "fast-path-names", "SELECT DISTINCT vendor FROM unified_expenses WHERE vendor IS NOT NULL")
+        employee_names = [row[0] for row in employees]
+        name_index_cache["indexes"] = {
+            "project": build_name_index([row[0] for row in projects]),
+            "employee": build_name_index(employee_names),
+            "employee_first": build_first_name_index(employee_names),
+            "vendor": build_name_index([row[0] for row in vendors]),
+        }
+    return name_index_cache["indexes"]
+
+async def answer_fast_path(question: str) -> Optional[str]:
+    """Answers a common question with prepared SQL, or returns None to use the agent."""
+    if db_pool is None:
         return None
+    async with db_pool.acquire() as conn:
+        match = match_question(question, await get_name_indexes(conn))
+        if match is None:
+            return None
+        template, name = match
+        params = (name,) if template["entity"] else ()
+        rows = await run_query(conn, f"fast-path:{template['name']}", template["sql"], *params)
+    print(f"--- Fast path '{template['name']}' answered: {question} ---")
+    return template["answer"](rows, name)
 
 # --- API Endpoints ---
 @app.get("/")
@@ -109,88 +462,166 @@ def read_root():
 # --- THE "AI CHATBOT" ENDPOINT ---
 # --- THE "AI CHATBOT" ENDPOINT ---
 @app.post("/ask-ai")
-def ask_ai_agent(query: AIQuery):
-    if agent_executor is None:
-        return {"question": query.question, "answer": "Error: AI Agent failed to initialize. Check API key and DB connection."}
-        
-    # --- THIS IS THE FIX ---
-    # We add the necessary instructions directly to the input string.
-    full_query = (
-        "You are an expert SQL analyst. To find which employee is blocked "
-        "and why, you MUST JOIN the 'unified_tasks' table with the "
-        "'unified_employees' table. Filter the 'unified_tasks' status by 'Blocked'. "
-        f"The user's question is: {query.question}"
-    )
-    
-    print(f"--- AI Agent received question: {query.question} ---")
+async def ask_ai_agent(query: AIQuery):
+    # Tag any SQL we run with this question in the slow-query log
+    question_token = current_question.set(query.question)
     try:
-        # We call the agent with our new, instructional query
-        result = agent_executor.invoke({"input": full_query})
-        
-        # The agent's final answer is in the 'output' key
-        answer = result.get("output", "I'm sorry, I couldn't find an answer.")
+        # Common question shapes are answered directly, without the LLM
+        try:
+            fast_answer = await answer_fast_path(query.question)
+        except Exception as e:
+            print(f"--- Fast path error, falling back to the agent: {e} ---")
+            fast_answer = None
+        if fast_answer is not None:
+            return {"question": query.question, "answer": fast_answer}
+
+        if agent_executor is None:
+            return {"question": query.question, "answer": "Error: AI Agent failed to initialize. Check API key and DB connection."}
+            
+        # We put only the tables and verified example queries that match this
+        # question into the input (see retrieval.py), so the agent can write
+        # its SQL without first listing tables and inspecting schemas.
+        full_query = (
+            "You are an expert SQL analyst.\n"
+            f"{build_agent_context(query.question)}\n"
+            f"The user's question is: {query.question}"
+        )
         
-        print(f"--- AI Agent response: {answer} ---")
-        return {"question": query.question, "answer": answer}
+        print(f"--- AI Agent received question: {query.question} ---")
+        try:
+            # We call the agent with our new, instructional query
+            # (in a worker thread, since the agent is synchronous)
+            result = await run_in_threadpool(agent_executor.invoke, {"input": full_query})
+            
+            # The agent's final answer is in the 'output' key
+            answer = result.get("output", "I'm sorry, I couldn't find an answer.")
+            
+            print(f"--- AI Agent response: {answer} ---")
+            return {"question": query.question, "answer": answer}
 
-    except Exception as e:
-        print(f"--- AI Agent Error: {e} ---")
-        return {"question": query.question, "answer": f"An error occurred: {e}"}
+        except Exception as e:
+            print(f"--- AI Agent Error: {e} ---")
+            return {"question": query.question, "answer": f"An error occurred: {e}"}
+    finally:
+        current_question.reset(question_token)
 # --- THE "FIXED REPORT" ENDPOINT ---
 @app.get("/reports/blocked-tasks", response_model=List[BlockedTaskReport])
-def get_blocked_task_report():
+async def get_blocked_task_report(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    sort_by: str = Query("task_id", pattern="^(" + "|".join(BLOCKED_TASKS_SORT_COLUMNS) + ")$"),
+    sort_dir: str = Query("asc", pattern="^(asc|desc)$"),
+):
     """
     This is the "smart" endpoint that runs our pre-built
     SQL query to find the *real* reason a task is blocked.
+    Supports paging (limit/offset) and sorting. The total row count is
+    sent in 'X-Total-Count', and an ETag lets clients skip unchanged pages.
     """
-    conn = get_db_connection()
-    if conn is None:
+    if db_pool is None:
         return {"error": "Database connection failed"}
-    
-    query = """
-    SELECT 
-        t.id AS task_id,
-        t.task_name,
-        p.name AS project_name,
-        e.name AS employee_name,
-        e.role AS employee_role,
-        t.status,
-        t.blocker_notes,
-        ex.id AS blocked_expense_id,
-        ex.vendor AS blocked_expense_vendor,
-        ex.status AS blocked_expense_status
-    FROM 
-        unified_tasks t
-    JOIN 
-        unified_projects p ON t.project_id = p.id
-    JOIN 
-        unified_employees e ON t.assignee_id = e.id
-    JOIN 
-        unified_expenses ex ON t.project_id = ex.project_id
-    WHERE 
-        t.status = 'Blocked'
-        AND t.blocker_notes LIKE 'Waiting for Expense ID ' || ex.id || '%';
+
+    async with db_pool.acquire() as conn:
+        # Answer a matching If-None-Match without running the report at all
+        version = await get_data_version(conn)
+        etag = make_etag(version, limit, offset, sort_by, sort_dir) if version else None
+        if etag and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # LIMIT NULL means "no limit", so unpaged callers still get everything
+        page_query = (
+            f"{BLOCKED_TASKS_QUERY} "
+            f"ORDER BY {BLOCKED_TASKS_SORT_COLUMNS[sort_by]} {sort_dir}, t.id "
+            "LIMIT $1 OFFSET $2"
+        )
+        rows = await run_query(conn, "blocked-tasks-report", page_query, limit, offset)
+        count_rows = await run_query(conn, "blocked-tasks-report", f"SELECT count(*) FROM ({BLOCKED_TASKS_QUERY}) AS report")
+        total = count_rows[0][0]
+
+    headers = {"X-Total-Count": str(total)}
+    if etag:
+        headers["ETag"] = etag
+
+    # Records already carry the column names, so they serialize directly
+    return ORJSONResponse([dict(row) for row in rows], headers=headers)
+
+# --- THE "LIVE" ENDPOINTS ---
+@app.get("/live/tasks", response_model=List[LiveTask])
+async def get_live_tasks(status: Optional[str] = None):
+    """Task status straight from the PM API (optionally filtered by status)."""
+    tasks, freshness = await fetch_live("pm", "/tasks")
+    if status:
+        tasks = [task for task in tasks if task["status"] == status]
+    return ORJSONResponse(tasks, headers=freshness_headers({"pm": freshness}))
+
+@app.get("/live/expenses", response_model=List[LiveExpense])
+async def get_live_expenses(status: Optional[str] = None):
+    """Expense approvals straight from the Finance API (e.g. ?status=Pending)."""
+    expenses, freshness = await fetch_live("finance", "/expenses")
+    if status:
+        expenses = [expense for expense in expenses if expense["status"] == status]
+    return ORJSONResponse(expenses, headers=freshness_headers({"finance": freshness}))
+
+@app.get("/live/blocked-tasks", response_model=List[BlockedTaskReport])
+async def get_live_blocked_task_report():
     """
-    
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        rows = cursor.fetchall()
-    
-    conn.close()
-    
+    The blocked-tasks report built from live data. All four source reads
+    run in parallel, then get joined the same way BLOCKED_TASKS_QUERY does.
+    """
+    (tasks, pm_fresh), (expenses, expenses_fresh), (projects, projects_fresh), (employees, hr_fresh) = await asyncio.gather(
+        fetch_live("pm", "/tasks"),
+        fetch_live("finance", "/expenses"),
+        fetch_live("finance", "/projects"),
+        fetch_live("hr", "/employees"),
+    )
+
+    projects_by_id = {project["id"]: project for project in projects}
+    employees_by_id = {employee["id"]: employee for employee in employees}
+    expenses_by_project = {}
+    for expense in expenses:
+        expenses_by_project.setdefault(expense["project_id"], []).append(expense)
+
     report = []
-    for row in rows:
-        report.append({
-            "task_id": row[0],
-            "task_name": row[1],
-            "project_name": row[2],
-            "employee_name": row[3],
-            "employee_role": row[4],
-            "status": row[5],
-            "blocker_notes": row[6],
-            "blocked_expense_id": row[7],
-            "blocked_expense_vendor": row[8],
-            "blocked_expense_status": row[9]
-        })
-        
-    return report
\ No newline at end of file
+    for task in sorted(tasks, key=lambda task: task["id"]):
+        if task["status"] != "Blocked" or not task["blocker_notes"]:
+            continue
+        project = projects_by_id.get(task["project_id"])
+        employee = employees_by_id.get(task["assignee_id"])
+        if project is None or employee is None:
+            continue
+        for expense in expenses_by_project.get(task["project_id"], []):
+            if task["blocker_notes"].startswith(f"Waiting for Expense ID {expense['id']}"):
+                report.append({
+                    "task_id": task["id"],
+                    "task_name": task["task_name"],
+                    "project_name": project["name"],
+                    "employee_name": employee["name"],
+                    "employee_role": employee["role"],
+                    "status": task["status"],
+                    "blocker_notes": task["blocker_notes"],
+                    "blocked_expense_id": expense["id"],
+                    "blocked_expense_vendor": expense["vendor"],
+                    "blocked_expense_status": expense["status"]
+                })
+
+    finance_fresh = max(expenses_fresh, projects_fresh, key=FRESHNESS_ORDER.index)
+    headers = freshness_headers({"hr": hr_fresh, "finance": finance_fresh, "pm": pm_fresh})
+    return ORJSONResponse(report, headers=headers)
+
+# --- THE "DEBUG" ENDPOINTS ---
+@app.get("/debug/slow-queries")
+def get_slow_queries(request: Request):
+    """
+    The slow-query log, newest first. Exists only when SLOW_QUERY_MS and
+    DEBUG_TOKEN are set, and needs the token in an 'X-Debug-Token' header.
+    'plan' fills in a moment later for the statements that were sampled.
+    """
+    if not SLOW_QUERY_MS or not DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(request.headers.get("x-debug-token", ""), DEBUG_TOKEN):
+        raise HTTPException(status_code=401, detail="Missing or invalid X-Debug-Token")
+    return {
+        "threshold_ms": SLOW_QUERY_MS,
+        "queries": list(reversed(slow_queries)),
+    }
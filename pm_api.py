@@ -1,6 +1,7 @@
 from typing import Optional, List
 import psycopg2
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 # --- Configuration ---
@@ -52,16 +53,7 @@ def get_all_tasks():
     
     conn.close()
     
-    # Manually convert tuples to dictionaries
-    tasks = []
-    for row in rows:
-        tasks.append({
-            "id": row[0],
-            "project_id": row[1],
-            "assignee_id": row[2],
-            "task_name": row[3],
-            "status": row[4],
-            "blocker_notes": row[5]
-        })
-        
-    return tasks
\ No newline at end of file
+    # Serialize the tuples directly. Returning a Response skips the
+    # response_model re-validation (the model is still used for the docs).
+    columns = ("id", "project_id", "assignee_id", "task_name", "status", "blocker_notes")
+    return ORJSONResponse([dict(zip(columns, row)) for row in rows])
\ No newline at end of file
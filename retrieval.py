@@ -0,0 +1,247 @@
+import math
+import re
+import hashlib
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# --- Retrieval for the SQL Agent ---
+# Before the agent runs, we look up the few tables and verified example
+# queries that match the question and put them straight into the prompt.
+# The agent then rarely needs to list tables or inspect schemas itself.
+#
+# The index is small and lives in memory. It is "hybrid": a keyword (BM25)
+# ranking and a vector ranking are merged, so exact words like 'vendor'
+# and looser matches like 'spent' -> 'spend' both count.
+# The embedding is a hashed bag of words/trigrams: deterministic, local,
+# and needs no model or network.
+# Only results above a relevance floor are returned; when nothing clears
+# it, the agent gets no hints and explores the schema as usual.
+
+EMBEDDING_DIM = 256
+RRF_K = 60 # Standard constant for reciprocal rank fusion
+MIN_BM25 = 1.0    # A result must share meaningful words with the question...
+MIN_COSINE = 0.3  # ...or be this similar to it, to count as relevant
+RELATIVE_FLOOR = 0.6 # ...and score at least this share of the best match
+
+# Words too common to say anything about which table or example fits
+STOPWORDS = {
+    "a", "an", "and", "are", "be", "by", "can", "did", "do", "doe", "for", "from", "has",
+    "have", "how", "i", "in", "is", "it", "me", "much", "of", "on", "or", "our", "show", "so",
+    "that", "the", "their", "there", "thi", "to", "was", "we", "what", "when",
+    "where", "which", "who", "why", "with", "you",
+}
+
+# --- Table Descriptions ---
+# Hand-written descriptions, in plain words people use in questions.
+# The schemas themselves come from the database at startup (see index_tables),
+# so new tables only need a line here to be found more easily.
+TABLE_DESCRIPTIONS = {
+    "unified_employees": "Employees, staff and people from the HR system: who works here, their job role and department.",
+    "unified_projects": "Projects from the Finance system with their name and total budget.",
+    "unified_expenses": "Expenses, spend and payments per project from the Finance system: vendor, amount, approval status and date.",
+    "unified_tasks": "Project tasks from the PM system: task name, assignee, status (e.g. Blocked) and blocker notes.",
+}
+
+# --- Verified Example Queries ---
+# (question, SQL) pairs that are known to be correct.
+# Add to this list whenever a new question shape is verified.
+VERIFIED_EXAMPLES = [
+    (
+        "Which employee is blocked and why?",
+        """SELECT e.name, t.task_name, t.blocker_notes
+FROM unified_tasks t
+JOIN unified_employees e ON t.assignee_id = e.id
+WHERE t.status = 'Blocked'""",
+    ),
+    (
+        "Which blocked tasks are waiting on an expense, and what is that expense's status?",
+        """SELECT t.task_name, e.name AS employee_name, ex.id AS expense_id, ex.vendor, ex.status
+FROM unified_tasks t
+JOIN unified_employees e ON t.assignee_id = e.id
+JOIN unified_expenses ex ON t.project_id = ex.project_id
+WHERE t.status = 'Blocked'
+  AND t.blocker_notes LIKE 'Waiting for Expense ID ' || ex.id || '%'""",
+    ),
+    (
+        "What is the total budget for the E-commerce UPI Integration project?",
+        """SELECT name, total_budget
+FROM unified_projects
+WHERE name ILIKE '%E-commerce UPI Integration%'""",
+    ),
+    (
+        "How much have we spent with each vendor?",
+        """SELECT vendor, SUM(amount) AS total_spend
+FROM unified_expenses
+GROUP BY vendor
+ORDER BY total_spend DESC""",
+    ),
+    (
+        "Which expenses are still pending approval?",
+        """SELECT ex.id, p.name AS project_name, ex.vendor, ex.amount, ex.date
+FROM unified_expenses ex
+JOIN unified_projects p ON ex.project_id = p.id
+WHERE ex.status = 'Pending'""",
+    ),
+    (
+        "How much of each project's budget has been spent so far?",
+        """SELECT p.name, p.total_budget,
+       COALESCE(SUM(ex.amount) FILTER (WHERE ex.status = 'Approved'), 0) AS spent,
+       COALESCE(SUM(ex.amount) FILTER (WHERE ex.status = 'Pending'), 0) AS pending
+FROM unified_projects p
+LEFT JOIN unified_expenses ex ON ex.project_id = p.id
+GROUP BY p.id, p.name, p.total_budget""",
+    ),
+    (
+        "What tasks is each employee working on?",
+        """SELECT e.name, e.role, t.task_name, t.status
+FROM unified_employees e
+JOIN unified_tasks t ON t.assignee_id = e.id
+ORDER BY e.name""",
+    ),
+]
+
+# --- Text Helpers ---
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words, with a crude plural/verb suffix strip ('tasks' -> 'task')."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    words = [word[:-1] if len(word) > 3 and word.endswith("s") else word for word in words]
+    return [word for word in words if word not in STOPWORDS]
+
+def embed(text: str) -> List[float]:
+    """
+    Deterministic local embedding: words and character trigrams hashed into
+    EMBEDDING_DIM buckets, then L2-normalised.
+    (md5 rather than hash(), which changes between Python processes.)
+    """
+    vector = [0.0] * EMBEDDING_DIM
+    for word in tokenize(text):
+        features = [word] + [word[i:i + 3] for i in range(len(word) - 2)]
+        for feature in features:
+            bucket = int(hashlib.md5(feature.encode()).hexdigest(), 16) % EMBEDDING_DIM
+            vector[bucket] += 1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+# --- Index ---
+class HybridIndex:
+    """An in-memory index ranking documents by BM25 and cosine similarity, fused."""
+    def __init__(self):
+        self.keys = []
+        self.tokens = []
+        self.vectors = []
+        self.document_frequency = Counter()
+
+    def add(self, key, text: str):
+        tokens = tokenize(text)
+        self.keys.append(key)
+        self.tokens.append(Counter(tokens))
+        self.vectors.append(embed(text))
+        self.document_frequency.update(set(tokens))
+
+    def _bm25_scores(self, query_tokens: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+        count = len(self.keys)
+        average_length = sum(sum(doc.values()) for doc in self.tokens) / max(count, 1)
+        scores = []
+        for doc in self.tokens:
+            length = sum(doc.values())
+            score = 0.0
+            for token in query_tokens:
+                frequency = doc.get(token, 0)
+                if not frequency:
+                    continue
+                df = self.document_frequency[token]
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                score += idf * frequency * (k1 + 1) / (frequency + k1 * (1 - b + b * length / average_length))
+            scores.append(score)
+        return scores
+
+    def search(self, query: str, k: int) -> List[Tuple[object, float]]:
+        """
+        Returns up to k (key, score) pairs, best first. Only documents that
+        clear the relevance floors are candidates, so an unrelated question
+        gets nothing rather than the "least bad" matches.
+        """
+        if not self.keys:
+            return []
+        query_vector = embed(query)
+        rankings = [
+            self._bm25_scores(tokenize(query)),
+            [sum(q * d for q, d in zip(query_vector, vector)) for vector in self.vectors],
+        ]
+        # Absolute floors, raised to a share of the best score so a weak
+        # runner-up doesn't ride along with a strong match
+        bm25_floor = max(MIN_BM25, RELATIVE_FLOOR * max(rankings[0]))
+        cosine_floor = max(MIN_COSINE, RELATIVE_FLOOR * max(rankings[1]))
+        relevant = [
+            i for i in range(len(self.keys))
+            if rankings[0][i] >= bm25_floor or rankings[1][i] >= cosine_floor
+        ]
+        # Reciprocal rank fusion: each ranking votes 1 / (RRF_K + rank)
+        fused = {i: 0.0 for i in relevant}
+        for scores in rankings:
+            order = sorted(relevant, key=lambda i: scores[i], reverse=True)
+            for rank, i in enumerate(order):
+                fused[i] += 1.0 / (RRF_K + rank + 1)
+        best = sorted(relevant, key=lambda i: fused[i], reverse=True)[:k]
+        return [(self.keys[i], fused[i]) for i in best]
+
+def build_example_index() -> HybridIndex:
+    index = HybridIndex()
+    for position, (question, _) in enumerate(VERIFIED_EXAMPLES):
+        index.add(position, question)
+    return index
+
+EXAMPLE_INDEX = build_example_index()
+
+# Filled in by index_tables() once the database schema is known
+TABLE_SCHEMAS: Dict[str, str] = {}
+TABLE_INDEX = HybridIndex()
+
+def index_tables(schemas: Dict[str, str]):
+    """
+    (Re)builds the table index from {table_name: schema text}, e.g. from
+    SQLDatabase.get_table_info() at startup.
+    """
+    global TABLE_INDEX
+    index = HybridIndex()
+    for table_name, schema in schemas.items():
+        description = TABLE_DESCRIPTIONS.get(table_name, "")
+        index.add(table_name, f"{table_name.replace('_', ' ')} {description} {schema}")
+    TABLE_SCHEMAS.clear()
+    TABLE_SCHEMAS.update(schemas)
+    TABLE_INDEX = index
+
+# --- Prompt Context ---
+def retrieve_context(question: str, k_tables: int = 2, k_examples: int = 2) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Returns (table names, example pairs) relevant to the question; either
+    can be empty. Tables used by a retrieved example are included too, so
+    every example's SQL can be read against the schema we show.
+    """
+    examples = [VERIFIED_EXAMPLES[i] for i, _ in EXAMPLE_INDEX.search(question, k_examples)]
+    tables = [name for name, _ in TABLE_INDEX.search(question, k_tables)]
+    for _, sql in examples:
+        for table_name in TABLE_SCHEMAS:
+            if re.search(rf"\b{table_name}\b", sql) and table_name not in tables:
+                tables.append(table_name)
+    return tables, examples
+
+def build_agent_context(question: str, k_tables: int = 2, k_examples: int = 2) -> str:
+    """
+    The prompt section with the schemas and example queries for this
+    question, or "" if nothing relevant was found (the agent then explores
+    the database itself, as it would without retrieval).
+    """
+    tables, examples = retrieve_context(question, k_tables, k_examples)
+    sections = []
+    if tables:
+        schemas = "\n\n".join(TABLE_SCHEMAS[name] for name in tables)
+        sections.append(
+            "These tables look relevant (schemas below, already inspected). "
+            "Only list or inspect other tables if these are not enough:\n"
+            f"{schemas}\n"
+        )
+    if examples:
+        example_text = "\n\n".join(f"Question: {q}\nSQL: {sql}" for q, sql in examples)
+        sections.append(f"Verified example queries for similar questions:\n{example_text}\n")
+    return "\n".join(sections)
@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+import pytest
+
+import fast_path
+
+EMPLOYEES = ["Priya Sharma", "Rahul Verma", "Will Turner"]
+
+NAME_INDEXES = {
+    "project": fast_path.build_name_index(["E-commerce UPI Integration", "Mobile App Redesign"]),
+    "employee": fast_path.build_name_index(EMPLOYEES),
+    "employee_first": fast_path.build_first_name_index(EMPLOYEES),
+    "vendor": fast_path.build_name_index(["AWS", "Infosys Ltd"]),
+}
+
+def route(question):
+    """(template name, entity name) for a question, or None for the agent."""
+    match = fast_path.match_question(question, NAME_INDEXES)
+    return match and (match[0]["name"], match[1])
+
+@pytest.mark.parametrize("question, expected", [
+    ("Which employee is blocked and why?", ("blocked_all", None)),
+    ("Who's blocked right now?", ("blocked_all", None)),
+    ("Show me all blocked tasks", ("blocked_all", None)),
+    ("Why is Priya Sharma blocked?", ("blocked_employee", "Priya Sharma")),
+    ("Is Rahul Varma blocked?", ("blocked_employee", "Rahul Verma")),
+    ("Is Will blocked?", ("blocked_employee", "Will Turner")),
+    ("What is the total budget for the E-commerce UPI Integration project?", ("project_budget", "E-commerce UPI Integration")),
+    ("How much have we spent with each vendor?", ("vendor_spend", None)),
+    ("How much did we pay AWS?", ("vendor_spend_single", "AWS")),
+])
+def test_common_shapes_take_the_fast_path(question, expected):
+    assert route(question) == expected
+
+@pytest.mark.parametrize("question", [
+    "Who is not blocked?",
+    "How many tasks are not blocked?",
+    "How many tasks are blocked per project?",
+    "Which pending expenses are blocking tasks?",
+    "Who will be blocked next week?",
+    "How much did we pay vendors last month?",
+    "How much did we spend on AWS last month?",
+    "How much did we spend with AWS in March?",
+    "Is the gateway task blocked?",
+    "What is the budget?",
+    "Who is the CEO?",
+])
+def test_other_questions_go_to_the_agent(question):
+    assert route(question) is None
+
+def test_shared_first_names_are_not_aliases():
+    first_names = fast_path.build_first_name_index(["Priya Sharma", "Priya Nair", "Rahul Verma"])
+    assert first_names == {"rahul": "Rahul Verma"}
+
+def test_budget_counts_only_approved_expenses():
+    rows = [{"name": "Mobile App Redesign", "total_budget": Decimal("1000.00"),
+             "approved": Decimal("100.00"), "pending": Decimal("50.00")}]
+    answer = fast_path.answer_budget(rows, "Mobile App Redesign")
+    assert "100.00 has been spent" in answer
+    assert "leaving 900.00" in answer
+    assert "50.00 is pending approval" in answer
@@ -0,0 +1,87 @@
+import pytest
+
+import retrieval
+
+# Shaped like SQLDatabase.get_table_info() output for the unified tables
+SCHEMAS = {
+    "unified_employees": """CREATE TABLE unified_employees (
+	id INTEGER NOT NULL,
+	name VARCHAR(100),
+	role VARCHAR(100),
+	department VARCHAR(100),
+	source_api VARCHAR(20),
+	CONSTRAINT unified_employees_pkey PRIMARY KEY (id)
+)""",
+    "unified_projects": """CREATE TABLE unified_projects (
+	id INTEGER NOT NULL,
+	name VARCHAR(255),
+	total_budget NUMERIC(12, 2),
+	source_api VARCHAR(20),
+	CONSTRAINT unified_projects_pkey PRIMARY KEY (id)
+)""",
+    "unified_expenses": """CREATE TABLE unified_expenses (
+	id INTEGER NOT NULL,
+	project_id INTEGER,
+	vendor VARCHAR(100),
+	description VARCHAR(255),
+	amount NUMERIC(10, 2),
+	status VARCHAR(20),
+	date DATE,
+	source_api VARCHAR(20),
+	CONSTRAINT unified_expenses_pkey PRIMARY KEY (id),
+	CONSTRAINT unified_expenses_project_id_fkey FOREIGN KEY(project_id) REFERENCES unified_projects (id)
+)""",
+    "unified_tasks": """CREATE TABLE unified_tasks (
+	id INTEGER NOT NULL,
+	project_id INTEGER,
+	assignee_id INTEGER,
+	task_name VARCHAR(255),
+	status VARCHAR(20),
+	blocker_notes TEXT,
+	source_api VARCHAR(20),
+	CONSTRAINT unified_tasks_pkey PRIMARY KEY (id),
+	CONSTRAINT unified_tasks_assignee_id_fkey FOREIGN KEY(assignee_id) REFERENCES unified_employees (id),
+	CONSTRAINT unified_tasks_project_id_fkey FOREIGN KEY(project_id) REFERENCES unified_projects (id)
+)""",
+}
+
+@pytest.fixture(autouse=True)
+def indexed_tables():
+    retrieval.index_tables(SCHEMAS)
+    yield
+    retrieval.index_tables({})
+
+def example_questions(examples):
+    return [question for question, _ in examples]
+
+def test_embed_is_deterministic_and_normalised():
+    vector = retrieval.embed("Which employee is blocked and why?")
+    assert vector == retrieval.embed("Which employee is blocked and why?")
+    assert len(vector) == retrieval.EMBEDDING_DIM
+    assert sum(value * value for value in vector) == pytest.approx(1.0)
+
+def test_unrelated_question_gets_no_context():
+    assert retrieval.retrieve_context("What's the weather like in Paris tomorrow?") == ([], [])
+    assert retrieval.build_agent_context("What's the weather like in Paris tomorrow?") == ""
+
+def test_blocked_question_gets_tasks_employees_and_blocked_example():
+    tables, examples = retrieval.retrieve_context("Who is blocked and why?")
+    assert {"unified_tasks", "unified_employees"} <= set(tables)
+    assert "Which employee is blocked and why?" in example_questions(examples)
+
+def test_vendor_question_skips_unrelated_tables():
+    tables, examples = retrieval.retrieve_context("How much have we spent with each vendor?")
+    assert "unified_expenses" in tables
+    assert "unified_employees" not in tables
+    assert "How much have we spent with each vendor?" in example_questions(examples)
+
+def test_context_shows_schemas_of_retrieved_tables():
+    context = retrieval.build_agent_context("Who is blocked and why?")
+    assert SCHEMAS["unified_tasks"] in context
+    assert "Verified example queries" in context
+
+def test_no_tables_indexed_still_returns_examples():
+    retrieval.index_tables({})
+    tables, examples = retrieval.retrieve_context("Who is blocked and why?")
+    assert tables == []
+    assert examples